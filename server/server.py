@@ -11,6 +11,8 @@ chore-tracker state.  Serves three purposes:
                   only need to visit http://<host>:<port>
 
 Dependencies:  pip install websockets  (or: apt install python3-websockets)
+Optional:      pip install orjson      (faster JSON; falls back to stdlib json)
+               pip install uvloop      (faster event loop; falls back to asyncio's)
 
 Usage:
   python3 server.py [--port PORT] [--data PATH] [--static DIR]
@@ -32,15 +34,20 @@ Examples:
 
 import argparse
 import asyncio
+import functools
 import json
 import logging
 import mimetypes
 import os
+import re
+import socket
+import stat
 import subprocess
 import tempfile
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
-from pathlib import Path
 from urllib.parse import unquote, urlparse
 
 logging.basicConfig(
@@ -64,9 +71,35 @@ except ImportError:
     print("Missing dependency. Install it with:\n  pip install websockets\nor:\n  apt install python3-websockets")
     raise SystemExit(1)
 
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def _loads(data):
+        # stdlib json doesn't accept memoryview request bodies
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return json.loads(data)
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # ── Defaults ──────────────────────────────────────────────────
 DEFAULT_PORT = 8780
 DEFAULT_DATA_FILE = "chore-data.json"
+# Pending-connection queue, so a burst of clients reconnecting after a restart isn't refused
+LISTEN_BACKLOG = 2048
 
 
 def _get_git_version() -> str:
@@ -103,14 +136,18 @@ MIME_OVERRIDES = {
 }
 
 
-def guess_mime(filepath: str) -> str:
-    ext = os.path.splitext(filepath)[1].lower()
+@functools.lru_cache(maxsize=64)
+def _mime_for_ext(ext: str) -> str:
     if ext in MIME_OVERRIDES:
         return MIME_OVERRIDES[ext]
-    mt, _ = mimetypes.guess_type(filepath)
+    mt, _ = mimetypes.guess_type("x" + ext)
     return mt or "application/octet-stream"
 
 
+def guess_mime(filepath: str) -> str:
+    return _mime_for_ext(os.path.splitext(filepath)[1].lower())
+
+
 # ── Persistence helpers ───────────────────────────────────────
 MAX_CHANGELOG_ENTRIES = 200
 changelog_file: str = ""  # set in __main__ based on data_file
@@ -124,23 +161,42 @@ def _ensure_changelog_file():
         changelog_file = f"{base}-changelog{ext}"
 
 
-def read_data() -> str:
-    """Return the raw JSON string from disk (or '{}' if missing)."""
+# (path, st_ino, st_mtime_ns, st_size) -> raw bytes of the last read/write
+_data_cache = None
+
+
+def _cache_key(path: str, st: os.stat_result) -> tuple:
+    return (path, st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def read_data() -> bytes:
+    """Return the raw JSON bytes from disk (or b'{}' if missing).
+
+    The file contents are cached in memory and only re-read when the file's
+    inode, mtime or size changes, so repeated GETs cost a single stat().
+    """
+    global _data_cache
     try:
-        with open(data_file, "r") as f:
-            return f.read()
+        st = os.stat(data_file)
+        key = _cache_key(data_file, st)
+        if _data_cache is not None and _data_cache[0] == key:
+            return _data_cache[1]
+        with open(data_file, "rb") as f:
+            buf = f.read()
+        _data_cache = (key, buf)
+        return buf
     except FileNotFoundError:
-        return "{}"
+        return b"{}"
     except OSError:
         log.exception("Failed to read data file %s", data_file)
-        return "{}"
+        return b"{}"
 
 
 def read_data_obj() -> dict:
     """Return the parsed JSON object from disk."""
     raw = read_data()
     try:
-        return json.loads(raw)
+        return _loads(raw)
     except json.JSONDecodeError:
         return {}
 
@@ -149,17 +205,54 @@ def _read_changelog() -> list:
     _ensure_changelog_file()
     if os.path.exists(changelog_file):
         try:
-            with open(changelog_file, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, OSError):
+            with open(changelog_file, "rb") as f:
+                return _loads(f.read())
+        except (ValueError, OSError):
             pass
     return []
 
 
 def _write_changelog(entries: list):
     _ensure_changelog_file()
-    with open(changelog_file, "w") as f:
-        json.dump(entries[-MAX_CHANGELOG_ENTRIES:], f)
+    _atomic_write(changelog_file, _dumps(entries[-MAX_CHANGELOG_ENTRIES:]), mode=_DEFAULT_FILE_MODE)
+
+
+# Mode open(path, "w") would give a new file, read once at startup (os.umask
+# can only be queried by setting it, which isn't safe from the write thread)
+_umask = os.umask(0)
+os.umask(_umask)
+_DEFAULT_FILE_MODE = 0o666 & ~_umask
+
+
+def _atomic_write(path: str, blob: bytes, mode: int = None) -> os.stat_result:
+    """Write blob to a temp file beside path, then rename it into place.
+
+    Readers see either the old or the new file, never a partial one. The file
+    keeps mkstemp's 0600 unless mode is given. Returns the stat of the written
+    file (its inode is the one now at path).
+    """
+    dir_name = os.path.dirname(os.path.abspath(path)) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=dir_name, suffix=".tmp")
+    try:
+        # Unbuffered writes straight to the fd; blob is already fully serialized
+        try:
+            if mode is not None and hasattr(os, "fchmod"):
+                os.fchmod(fd, mode)
+            view = memoryview(blob)
+            while view:
+                view = view[os.write(fd, view):]
+            st = os.fstat(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Clean up the temp file if anything goes wrong
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return st
 
 
 def _compute_entries_diff(old_entries: dict, new_entries: dict) -> list:
@@ -237,7 +330,7 @@ class VersionConflict(Exception):
         self.server_data = server_data
 
 
-def write_data(body: str, client_id: str = "", client_label: str = "",
+def write_data(body, client_id: str = "", client_label: str = "",
                base_version: int = None) -> int:
     """Atomically write JSON to disk, stamping a _version field. Returns the new version.
 
@@ -245,10 +338,20 @@ def write_data(body: str, client_id: str = "", client_label: str = "",
     raises VersionConflict so the caller can return 409.
     """
     try:
-        obj = json.loads(body)
+        obj = _loads(body)
     except json.JSONDecodeError:
         raise ValueError("Invalid JSON")
+    version, _ = _write_obj(obj, client_id, client_label, base_version)
+    return version
+
 
+def _write_obj(obj: dict, client_id: str = "", client_label: str = "",
+               base_version: int = None) -> tuple:
+    """Like write_data, for an already-parsed object. Returns (version, serialized bytes).
+
+    obj is stamped with the new _version in place.
+    """
+    global _data_cache
     current = read_data_obj()
     current_version = current.get("_version", 0)
 
@@ -263,20 +366,11 @@ def write_data(body: str, client_id: str = "", client_label: str = "",
     struct_changes = _compute_structure_diff(current, obj)
 
     obj["_version"] = max(int(time.time() * 1000), current_version + 1)
-    # Write to a temp file then atomically rename to avoid corruption
-    dir_name = os.path.dirname(os.path.abspath(data_file)) or "."
-    fd, tmp_path = tempfile.mkstemp(dir=dir_name, suffix=".tmp")
-    try:
-        with os.fdopen(fd, "w") as f:
-            json.dump(obj, f)
-        os.replace(tmp_path, data_file)
-    except BaseException:
-        # Clean up the temp file if anything goes wrong
-        try:
-            os.unlink(tmp_path)
-        except OSError:
-            pass
-        raise
+    blob = _dumps(obj)
+    st = _atomic_write(data_file, blob)
+
+    # Prime the read cache so the next GET doesn't go back to disk
+    _data_cache = (_cache_key(data_file, st), blob)
 
     # Record changelog entry (only if something actually changed)
     if entry_changes or struct_changes:
@@ -292,23 +386,139 @@ def write_data(body: str, client_id: str = "", client_label: str = "",
         })
         _write_changelog(cl)
 
-    return obj["_version"]
+    return obj["_version"], blob
+
+
+def _rollback_changelog_entry(target_ts: int, client_id: str = "", client_label: str = ""):
+    """Reverse the entry changes recorded at target_ts and write the result.
+
+    Returns the new version, or None if there is no changelog entry with that ts.
+    """
+    cl = _read_changelog()
+    target_entry = None
+    for entry in cl:
+        if entry["ts"] == target_ts:
+            target_entry = entry
+            break
+    if not target_entry:
+        return None
+    current = read_data_obj()
+    entries = current.get("entries", {})
+    for ch in target_entry.get("entry_changes", []):
+        date, room, task = ch["date"], ch["room"], ch["task"]
+        if ch["type"] == "checked":
+            if date in entries and room in entries[date]:
+                tasks = entries[date][room].get("tasks", {})
+                tasks.pop(task, None)
+                if not tasks:
+                    del entries[date][room]
+                if not entries[date]:
+                    del entries[date]
+        elif ch["type"] == "unchecked":
+            entries.setdefault(date, {}).setdefault(room, {"tasks": {}})
+            entries[date][room]["tasks"][task] = {"cleaned": True, "user": ch.get("user", "?")}
+    current["entries"] = entries
+    version, _ = _write_obj(
+        current,
+        client_id=client_id,
+        client_label=f"rollback by {client_label or client_id}",
+    )
+    return version
+
+
+def _delete_changelog_entry(target_ts: int) -> bool:
+    """Remove the changelog entry with the given ts. Returns False if there was none."""
+    cl = _read_changelog()
+    new_cl = [e for e in cl if e["ts"] != target_ts]
+    if len(new_cl) == len(cl):
+        return False
+    _write_changelog(new_cl)
+    return True
+
+
+# Disk writes run on a single worker thread: the event loop keeps serving other
+# clients meanwhile, and each read-modify-write still runs alone and in order
+_write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chore-write")
+
+
+async def _run_write(func, *args, **kwargs):
+    """Run a persistence function on the write thread and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_write_executor, functools.partial(func, *args, **kwargs))
 
 
 # ── Broadcast ─────────────────────────────────────────────────
+# Clients that can't accept a notification within this many seconds are dropped
+BROADCAST_SEND_TIMEOUT = 5
+
+# Strong references to fire-and-forget tasks so they aren't garbage-collected mid-run
+_background_tasks: set = set()
+
+# Fixed-shape messages, so only the integer version needs formatting (sent as text frames)
+_BROADCAST_TMPL = '{"type":"data-changed","version":%d}'
+_ACK_TMPL = '{"type":"ack","version":%d}'
+
+
 async def broadcast(version: int, sender=None):
-    """Notify every connected WS client (except the sender) that data changed."""
-    msg = json.dumps({"type": "data-changed", "version": version})
-    for ws in list(CLIENTS):
-        if ws is sender:
-            continue
-        try:
-            await ws.send(msg)
-        except Exception:
+    """Notify every connected WS client (except the sender) that data changed.
+
+    Sends run concurrently so one slow client doesn't delay the others.
+    """
+    msg = _BROADCAST_TMPL % version
+    targets = [ws for ws in CLIENTS if ws is not sender]
+    if not targets:
+        return
+    results = await asyncio.gather(
+        *(asyncio.wait_for(ws.send(msg), BROADCAST_SEND_TIMEOUT) for ws in targets),
+        return_exceptions=True,
+    )
+    for ws, result in zip(targets, results):
+        if isinstance(result, asyncio.TimeoutError):
+            # Still connected but not draining; close it so the client reconnects
+            CLIENTS.discard(ws)
+            log.info("Closing slow WebSocket client during broadcast")
+            task = asyncio.ensure_future(ws.close())
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+        elif isinstance(result, Exception):
             CLIENTS.discard(ws)
             log.info("Removed stale WebSocket client during broadcast")
 
 
+# Writes landing within this many seconds of each other share one broadcast
+BROADCAST_COALESCE_DELAY = 0.005
+_pending_version = None  # newest version not yet broadcast
+_pending_senders: set = set()
+_broadcast_task = None
+
+
+def schedule_broadcast(version: int, sender=None):
+    """Queue a data-changed notification; a burst of writes is announced once.
+
+    Clients re-fetch the whole blob on notification, so only the newest
+    version matters. The sender is skipped only if every coalesced write
+    came from it.
+    """
+    global _pending_version, _broadcast_task
+    if _pending_version is None or version > _pending_version:
+        _pending_version = version
+    _pending_senders.add(sender)
+    if _broadcast_task is None or _broadcast_task.done():
+        _broadcast_task = asyncio.ensure_future(_flush_broadcasts())
+
+
+async def _flush_broadcasts():
+    global _pending_version
+    # Loop so writes queued while a fan-out was in progress are sent too
+    while _pending_version is not None:
+        await asyncio.sleep(BROADCAST_COALESCE_DELAY)
+        version = _pending_version
+        sender = next(iter(_pending_senders)) if len(_pending_senders) == 1 else None
+        _pending_version = None
+        _pending_senders.clear()
+        await broadcast(version, sender=sender)
+
+
 # ── HTTP Server (REST API) ────────────────────────────────────
 CORS_HEADERS = (
     ("Access-Control-Allow-Origin", "*"),
@@ -317,217 +527,452 @@ CORS_HEADERS = (
 )
 
 
+STATUS_REASONS = {200: "OK", 204: "No Content", 400: "Bad Request", 404: "Not Found", 409: "Conflict", 413: "Payload Too Large"}
+
+
+def _encode_headers(headers) -> bytes:
+    return b"".join(f"{k}: {v}\r\n".encode("latin-1") for k, v in headers)
+
+
+# Pre-encoded header fragments, so a response is a single b"".join
+_STATUS_LINES = {code: f"HTTP/1.1 {code} {reason}\r\n".encode("ascii") for code, reason in STATUS_REASONS.items()}
+_CORS_BLOCK = _encode_headers(CORS_HEADERS)
+_HEAD_END_CLOSE = b"Connection: close\r\n\r\n"
+_HEAD_END_KEEP_ALIVE = b"Connection: keep-alive\r\n\r\n"
+
+
+def _build_head(status, content_type, content_length, extra_headers=()) -> bytes:
+    """Return the encoded status line and headers, up to (not including) Connection."""
+    status_line = _STATUS_LINES.get(status) or f"HTTP/1.1 {status} OK\r\n".encode("ascii")
+    extra = _CORS_BLOCK if extra_headers is CORS_HEADERS else _encode_headers(extra_headers)
+    return b"".join((
+        status_line,
+        b"Content-Type: ", content_type.encode("latin-1"),
+        b"\r\nContent-Length: ", str(content_length).encode("ascii"), b"\r\n",
+        extra,
+    ))
+
+
+# ── Static files ──────────────────────────────────────────────
+# (static_root, rel) -> (filepath, st_mtime_ns, st_size, head_bytes), LRU order
+STATIC_CACHE_SIZE = 64
+_static_cache: OrderedDict = OrderedDict()
+
+
+@functools.lru_cache(maxsize=None)
+def _real_root(root: str) -> str:
+    """Resolve a static root once rather than on every request."""
+    return os.path.realpath(root)
+
+
+def _open_fd(filepath: str):
+    """Open a regular file read-only; return (fd, stat) or None.
+
+    O_NONBLOCK keeps a FIFO in the tree from stalling the event loop; it has
+    no effect on regular files.
+    """
+    try:
+        fd = os.open(filepath, os.O_RDONLY | getattr(os, "O_NONBLOCK", 0))
+    except (OSError, ValueError):
+        return None
+    st = os.fstat(fd)
+    if not stat.S_ISREG(st.st_mode):
+        os.close(fd)
+        return None
+    return fd, st
+
+
+def _open_static(rel: str):
+    """Open a static file; return (file, head_bytes, size) or None if not servable.
+
+    The size and mtime come from fstat on the opened fd, so Content-Length
+    always matches the file actually sent. Cache hits cost an open and an
+    fstat; misses also check the path stays inside static_root and build
+    the headers.
+    """
+    key = (static_root, rel)
+    entry = _static_cache.get(key)
+    if entry is not None:
+        filepath, mtime_ns, size, head = entry
+        opened = _open_fd(filepath)
+        if opened is not None:
+            fd, st = opened
+            if st.st_mtime_ns == mtime_ns and st.st_size == size:
+                _static_cache.move_to_end(key)
+                return open(fd, "rb", buffering=0), head, size
+            os.close(fd)
+        del _static_cache[key]
+
+    # Normalise as a string (no syscalls) and ensure it stays inside static_root
+    root = _real_root(static_root)
+    filepath = os.path.normpath(os.path.join(root, rel))
+    if not filepath.startswith(root + os.sep):
+        return None
+    opened = _open_fd(filepath)
+    if opened is None:
+        return None
+    fd, st = opened
+    # A symlink inside the tree could still point outside it; this runs only
+    # on cache misses for files that exist
+    real = os.path.realpath(filepath)
+    if real != filepath and not real.startswith(root + os.sep):
+        os.close(fd)
+        return None
+    head = _build_head(200, guess_mime(filepath), st.st_size, CORS_HEADERS)
+
+    _static_cache[key] = (filepath, st.st_mtime_ns, st.st_size, head)
+    if len(_static_cache) > STATIC_CACHE_SIZE:
+        _static_cache.popitem(last=False)
+    return open(fd, "rb", buffering=0), head, st.st_size
+
+
 class RESTProtocol(asyncio.Protocol):
-    """Minimal HTTP/1.1 protocol handler for the REST API."""
+    """Minimal HTTP/1.1 protocol handler for the REST API.
+
+    Connections are kept alive between requests (unless the client asks
+    otherwise) and requests are handled one at a time, in order; reading is
+    paused while a request is being handled.
+    """
 
     # Maximum request size (headers + body): 1 MB
     MAX_REQUEST_SIZE = 1 * 1024 * 1024
+    # Close connections after this many seconds without receiving any bytes
+    # (between requests, or mid-request from a stalled client)
+    KEEP_ALIVE_TIMEOUT = 15
+
+    # Request headers the handlers read; all others are never parsed
+    REQUEST_HEADERS = ("content-length", "transfer-encoding", "connection",
+                       "x-client-id", "x-client-label", "x-base-version")
+    _HEADER_NEEDLES = tuple((name, f"\r\n{name}:".encode("ascii")) for name in REQUEST_HEADERS)
+    # A header line with whitespace between the field name and the colon
+    # (RFC 9112 §5.1 requires rejecting these; the needles above would miss them)
+    _WS_BEFORE_COLON = re.compile(rb"\r\n[^\r\n:]*[ \t]:")
+    # Content-Length is 1*DIGIT (RFC 9110 §8.6); int() would also take "+5",
+    # "1_0" and non-ASCII digits, which an intermediary reads differently
+    _CONTENT_LENGTH = re.compile(r"[0-9]+", re.ASCII)
 
     def connection_made(self, transport):
         self.transport = transport
-        self._buf = b""
+        # Responses are small single writes; don't let Nagle hold them back
+        sock = transport.get_extra_info("socket")
+        if sock is not None:
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            except OSError:
+                pass
+        # bytearray so appending each segment is amortised O(1), not a full copy
+        self._buf = bytearray()
+        self._busy = False  # a request is being handled
+        self._keep_alive = False
+        self._idle_timer = None
+        self._last_received = 0.0
+        self._reset_request()
+        self._arm_idle_timer()
+
+    def connection_lost(self, exc):
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _reset_request(self):
+        self._header_end = -1
+        self._scanned = 0  # bytes already searched for the end of headers
+
+    def _arm_idle_timer(self, delay=None):
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+        loop = asyncio.get_running_loop()
+        if delay is None:
+            delay = self.KEEP_ALIVE_TIMEOUT
+            self._last_received = loop.time()
+        self._idle_timer = loop.call_later(delay, self._idle_timeout)
+
+    def _idle_timeout(self):
+        self._idle_timer = None
+        if self._busy:
+            self._arm_idle_timer()
+            return
+        # Bytes arrived since the timer was armed: wait out the rest of the
+        # timeout from the last segment instead of re-arming on every segment
+        remaining = self._last_received + self.KEEP_ALIVE_TIMEOUT - asyncio.get_running_loop().time()
+        if remaining > 0:
+            self._arm_idle_timer(remaining)
+            return
+        self.transport.close()
 
     def data_received(self, data):
-        self._buf += data
+        self._last_received = asyncio.get_running_loop().time()
+        self._buf.extend(data)
 
         # Guard against excessively large requests
         if len(self._buf) > self.MAX_REQUEST_SIZE:
             log.warning("Request too large (%d bytes), dropping connection", len(self._buf))
+            self._keep_alive = False
             self._respond(413, "Request too large\n")
             return
 
-        # Wait until we have full headers
-        if b"\r\n\r\n" not in self._buf:
+        if not self._busy:
+            self._process_buffer()
+
+    def _process_buffer(self):
+        """Dispatch the next request once it has fully arrived in the buffer."""
+        if self.transport.is_closing():
+            return
+
+        # Wait until we have full headers, then parse them only once
+        if self._header_end < 0:
+            # Resume where the last scan stopped (minus 3 bytes in case the
+            # terminator straddles two segments) so each byte is searched once
+            header_end = self._buf.find(b"\r\n\r\n", max(0, self._scanned - 3))
+            if header_end < 0:
+                self._scanned = len(self._buf)
+                return
+            if not self._parse_headers(header_end):
+                return
+
+        # Wait for full body
+        body_end = self._body_start + self._content_length
+        if len(self._buf) < body_end:
             return
-        header_end = self._buf.index(b"\r\n\r\n")
-        header_block = self._buf[:header_end].decode("utf-8", errors="replace")
-        body_start = header_end + 4
 
-        lines = header_block.split("\r\n")
-        request_line = lines[0]
+        # Hand the current buffer to the handler as a zero-copy view and
+        # start a fresh one for whatever follows (pipelined requests)
+        body = memoryview(self._buf)[self._body_start:body_end]
+        self._buf = bytearray(self._buf[body_end:])
+        self._reset_request()
+        self._busy = True
+        # Don't read ahead while this request is handled; the socket buffer
+        # applies backpressure to pipelining clients
+        self.transport.pause_reading()
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+        # Route — schedule and log any unexpected errors
+        task = asyncio.ensure_future(self._handle(self._method, self._path, body, self._headers))
+        task.add_done_callback(self._handle_done)
+
+    def _parse_headers(self, header_end):
+        """Parse the request line and headers; respond 400 and return False if malformed."""
+        header_block = self._buf[:header_end]
+
+        line_end = header_block.find(b"\r\n")
+        if line_end < 0:
+            line_end = header_end
+        request_line = header_block[:line_end].decode("utf-8", errors="replace")
         parts = request_line.split(" ", 2)
         if len(parts) < 2:
+            self._keep_alive = False
             self._respond(400, "Bad request\n")
-            return
+            return False
         method, path = parts[0], parts[1]
+        version = parts[2] if len(parts) > 2 else "HTTP/1.0"
+
+        # Refuse anything that could make our framing disagree with a proxy's:
+        # "Name : value" lines, and more than one Content-Length (RFC 9112 §6.3)
+        lowered = header_block.lower()
+        if (self._WS_BEFORE_COLON.search(header_block) is not None
+                or lowered.count(b"\r\ncontent-length:") > 1):
+            self._keep_alive = False
+            self._respond(400, "Bad request\n")
+            return False
 
-        # Parse headers
+        # Pick out only the headers the handlers use, without splitting the block
         headers = {}
-        for line in lines[1:]:
-            if ":" in line:
-                k, v = line.split(":", 1)
-                headers[k.strip().lower()] = v.strip()
-
-        try:
-            content_length = int(headers.get("content-length", 0))
-        except ValueError:
+        for name, needle in self._HEADER_NEEDLES:
+            start = lowered.find(needle)
+            if start < 0:
+                continue
+            start += len(needle)
+            end = header_block.find(b"\r\n", start)
+            if end < 0:
+                end = header_end
+            headers[name] = header_block[start:end].strip().decode("utf-8", errors="replace")
+
+        # HTTP/1.1 defaults to keep-alive, HTTP/1.0 has to opt in; the header
+        # is a comma-separated option list (RFC 9112 §9.6)
+        tokens = {t.strip().lower() for t in headers.get("connection", "").split(",")}
+        if version == "HTTP/1.1":
+            self._keep_alive = "close" not in tokens
+        else:
+            self._keep_alive = "keep-alive" in tokens
+
+        # Bodies are framed by Content-Length only; a chunked body would be read
+        # as the next request on a kept-alive connection, so refuse it outright
+        if "transfer-encoding" in headers:
+            self._keep_alive = False
+            self._respond(400, "Transfer-Encoding not supported\n")
+            return False
+
+        raw_length = headers.get("content-length", "0")
+        if not self._CONTENT_LENGTH.fullmatch(raw_length):
+            self._keep_alive = False
             self._respond(400, "Invalid Content-Length\n")
+            return False
+        content_length = int(raw_length)
+
+        self._method, self._path, self._headers = method, path, headers
+        self._content_length = content_length
+        self._body_start = header_end + 4
+        self._header_end = header_end
+        return True
+
+    def _handle_done(self, task):
+        """Log unhandled handler errors, then move on to the next request."""
+        self._busy = False
+        if not task.cancelled():
+            exc = task.exception()
+            if exc is not None:
+                log.exception("Unhandled error in request handler", exc_info=exc)
+                self.transport.close()
+                return
+        if self.transport.is_closing():
             return
+        self.transport.resume_reading()
+        self._arm_idle_timer()
+        self._process_buffer()
 
-        body = self._buf[body_start : body_start + content_length]
+    async def _handle(self, method, path, body, headers):
+        handler = self.ROUTES.get((method, path))
+        if handler is None:
+            if method == "OPTIONS":
+                handler = RESTProtocol._options
+            elif method == "DELETE" and path.startswith("/changelog/"):
+                handler = RESTProtocol._delete_changelog
+            elif method == "GET" and static_root:
+                handler = RESTProtocol._get_static
+            else:
+                handler = RESTProtocol._not_found
+        await handler(self, path, body, headers)
+
+    async def _options(self, path, body, headers):
+        self._respond(204, "", extra_headers=CORS_HEADERS)
+
+    async def _not_found(self, path, body, headers):
+        self._respond(404, "Not found\n", extra_headers=CORS_HEADERS)
 
-        # Wait for full body
-        if len(body) < content_length:
-            return
+    async def _get_version(self, path, body, headers):
+        ver = _git_version or "unknown"
+        body_str = json.dumps({"version": ver})
+        self._respond(200, body_str, content_type="application/json", extra_headers=CORS_HEADERS)
 
-        # Route — schedule and log any unexpected errors
-        task = asyncio.ensure_future(self._handle(method, path, body, headers))
-        task.add_done_callback(self._handle_task_error)
+    async def _get_data(self, path, body, headers):
+        data = read_data()
+        self._respond(200, data, content_type="application/json", extra_headers=CORS_HEADERS)
 
-    @staticmethod
-    def _handle_task_error(task):
-        """Log unhandled exceptions from request handler tasks."""
-        if task.cancelled():
+    async def _put_data(self, path, body, headers):
+        client_id = headers.get("x-client-id", "")
+        client_label = headers.get("x-client-label", "")
+        base_version_str = headers.get("x-base-version", "")
+        base_version = int(base_version_str) if base_version_str else None
+        try:
+            version = await _run_write(
+                write_data,
+                body,
+                client_id=client_id,
+                client_label=client_label,
+                base_version=base_version,
+            )
+        except VersionConflict as exc:
+            resp_body = _dumps({
+                "error": "version_conflict",
+                "server_version": exc.server_version,
+                "server_data": exc.server_data,
+            })
+            self._respond(409, resp_body, content_type="application/json", extra_headers=CORS_HEADERS)
             return
-        exc = task.exception()
-        if exc is not None:
-            log.exception("Unhandled error in request handler", exc_info=exc)
-
-    async def _handle(self, method, path, body, headers):
-        if method == "OPTIONS":
-            self._respond(204, "", extra_headers=CORS_HEADERS)
+        except ValueError as exc:
+            self._respond(400, str(exc), extra_headers=CORS_HEADERS)
             return
+        schedule_broadcast(version)
+        resp_body = _dumps({"version": version})
+        self._respond(200, resp_body, content_type="application/json", extra_headers=CORS_HEADERS)
 
-        if path == "/version":
-            if method == "GET":
-                ver = _git_version or "unknown"
-                body_str = json.dumps({"version": ver})
-                self._respond(200, body_str, content_type="application/json", extra_headers=CORS_HEADERS)
-                return
-
-        if path == "/data":
-            if method == "GET":
-                data = read_data()
-                self._respond(200, data, content_type="application/json", extra_headers=CORS_HEADERS)
-                return
-            if method == "PUT":
-                client_id = headers.get("x-client-id", "")
-                client_label = headers.get("x-client-label", "")
-                base_version_str = headers.get("x-base-version", "")
-                base_version = int(base_version_str) if base_version_str else None
-                try:
-                    version = write_data(
-                        body.decode("utf-8"),
-                        client_id=client_id,
-                        client_label=client_label,
-                        base_version=base_version,
-                    )
-                except VersionConflict as exc:
-                    resp_body = json.dumps({
-                        "error": "version_conflict",
-                        "server_version": exc.server_version,
-                        "server_data": exc.server_data,
-                    })
-                    self._respond(409, resp_body, content_type="application/json", extra_headers=CORS_HEADERS)
-                    return
-                except ValueError as exc:
-                    self._respond(400, str(exc), extra_headers=CORS_HEADERS)
-                    return
-                await broadcast(version)
-                resp_body = json.dumps({"version": version})
-                self._respond(200, resp_body, content_type="application/json", extra_headers=CORS_HEADERS)
-                return
-
-        # ── Changelog endpoints ─────────────────────────────────
-        if path == "/changelog":
-            if method == "GET":
-                cl = _read_changelog()
-                self._respond(200, json.dumps(cl), content_type="application/json", extra_headers=CORS_HEADERS)
-                return
+    # ── Changelog endpoints ─────────────────────────────────────
+    async def _get_changelog(self, path, body, headers):
+        cl = _read_changelog()
+        self._respond(200, json.dumps(cl), content_type="application/json", extra_headers=CORS_HEADERS)
 
-        if path == "/changelog/rollback" and method == "POST":
-            try:
-                req = json.loads(body.decode("utf-8"))
-                target_ts = int(req["ts"])
-                client_id = headers.get("x-client-id", "")
-                client_label = headers.get("x-client-label", "")
-            except (json.JSONDecodeError, KeyError, ValueError):
-                self._respond(400, "Invalid rollback request", extra_headers=CORS_HEADERS)
-                return
-            cl = _read_changelog()
-            target_entry = None
-            for entry in cl:
-                if entry["ts"] == target_ts:
-                    target_entry = entry
-                    break
-            if not target_entry:
-                self._respond(404, "Changelog entry not found", extra_headers=CORS_HEADERS)
-                return
-            current = read_data_obj()
-            entries = current.get("entries", {})
-            for ch in target_entry.get("entry_changes", []):
-                date, room, task = ch["date"], ch["room"], ch["task"]
-                if ch["type"] == "checked":
-                    if date in entries and room in entries[date]:
-                        tasks = entries[date][room].get("tasks", {})
-                        tasks.pop(task, None)
-                        if not tasks:
-                            del entries[date][room]
-                        if not entries[date]:
-                            del entries[date]
-                elif ch["type"] == "unchecked":
-                    entries.setdefault(date, {}).setdefault(room, {"tasks": {}})
-                    entries[date][room]["tasks"][task] = {"cleaned": True, "user": ch.get("user", "?")}
-            current["entries"] = entries
-            version = write_data(
-                json.dumps(current),
-                client_id=client_id,
-                client_label=f"rollback by {client_label or client_id}",
-            )
-            await broadcast(version)
-            self._respond(200, json.dumps({"version": version}), content_type="application/json", extra_headers=CORS_HEADERS)
+    async def _rollback_changelog(self, path, body, headers):
+        try:
+            req = _loads(body)
+            target_ts = int(req["ts"])
+            client_id = headers.get("x-client-id", "")
+            client_label = headers.get("x-client-label", "")
+        except (json.JSONDecodeError, KeyError, ValueError):
+            self._respond(400, "Invalid rollback request", extra_headers=CORS_HEADERS)
+            return
+        version = await _run_write(_rollback_changelog_entry, target_ts, client_id, client_label)
+        if version is None:
+            self._respond(404, "Changelog entry not found", extra_headers=CORS_HEADERS)
             return
+        schedule_broadcast(version)
+        self._respond(200, json.dumps({"version": version}), content_type="application/json", extra_headers=CORS_HEADERS)
 
-        if path.startswith("/changelog/") and method == "DELETE":
-            ts_str = path.split("/")[-1]
+    async def _delete_changelog(self, path, body, headers):
+        ts_str = path.split("/")[-1]
+        try:
+            target_ts = int(ts_str)
+        except ValueError:
+            self._respond(400, "Invalid timestamp", extra_headers=CORS_HEADERS)
+            return
+        if not await _run_write(_delete_changelog_entry, target_ts):
+            self._respond(404, "Changelog entry not found", extra_headers=CORS_HEADERS)
+            return
+        self._respond(200, json.dumps({"ok": True}), content_type="application/json", extra_headers=CORS_HEADERS)
+
+    # ── Static file fallback ────────────────────────────────────
+    async def _get_static(self, path, body, headers):
+        # Map "/" → "index.html"
+        rel = path.lstrip("/") or "index.html"
+        rel = unquote(rel)
+        found = _open_static(rel)
+        if found is None:
+            await self._not_found(path, body, headers)
+            return
+        await self._send_file(*found)
+
+    # Exact (method, path) routes; OPTIONS, DELETE /changelog/<ts> and static
+    # files are handled as fallbacks in _handle
+    ROUTES = {
+        ("GET", "/version"): _get_version,
+        ("GET", "/data"): _get_data,
+        ("PUT", "/data"): _put_data,
+        ("GET", "/changelog"): _get_changelog,
+        ("POST", "/changelog/rollback"): _rollback_changelog,
+    }
+
+    async def _send_file(self, f, head, size):
+        """Write headers, then let the kernel copy the open file to the socket."""
+        with f:
             try:
-                target_ts = int(ts_str)
-            except ValueError:
-                self._respond(400, "Invalid timestamp", extra_headers=CORS_HEADERS)
-                return
-            cl = _read_changelog()
-            new_cl = [e for e in cl if e["ts"] != target_ts]
-            if len(new_cl) == len(cl):
-                self._respond(404, "Changelog entry not found", extra_headers=CORS_HEADERS)
+                self.transport.writelines((head, self._head_end()))
+                if size:
+                    try:
+                        await asyncio.get_running_loop().sendfile(self.transport, f, 0, size)
+                    except NotImplementedError:
+                        # uvloop has no loop.sendfile; copy through userspace instead
+                        self.transport.write(f.read(size))
+            except Exception:
+                log.debug("Client disconnected during static file transfer")
+                self.transport.close()
                 return
-            _write_changelog(new_cl)
-            self._respond(200, json.dumps({"ok": True}), content_type="application/json", extra_headers=CORS_HEADERS)
-            return
+        if not self._keep_alive:
+            self.transport.close()
 
-        # ── Static file fallback ────────────────────────────────
-        if method == "GET" and static_root:
-            # Map "/" → "index.html"
-            rel = path.lstrip("/") or "index.html"
-            rel = unquote(rel)
-            # Resolve and ensure it stays inside static_root
-            requested = Path(static_root, rel).resolve()
-            root = Path(static_root).resolve()
-            if str(requested).startswith(str(root)) and requested.is_file():
-                try:
-                    content = requested.read_bytes()
-                    ct = guess_mime(str(requested))
-                    self._respond(200, content, content_type=ct, extra_headers=CORS_HEADERS)
-                    return
-                except OSError:
-                    pass
-
-        self._respond(404, "Not found\n", extra_headers=CORS_HEADERS)
+    def _head_end(self):
+        return _HEAD_END_KEEP_ALIVE if self._keep_alive else _HEAD_END_CLOSE
 
     def _respond(self, status, body, content_type="text/plain", extra_headers=()):
         if isinstance(body, str):
             body = body.encode("utf-8")
-        reason = {200: "OK", 204: "No Content", 400: "Bad Request", 404: "Not Found", 409: "Conflict", 413: "Payload Too Large"}.get(status, "OK")
-        lines = [f"HTTP/1.1 {status} {reason}"]
-        lines.append(f"Content-Type: {content_type}")
-        lines.append(f"Content-Length: {len(body)}")
-        for k, v in extra_headers:
-            lines.append(f"{k}: {v}")
-        lines.append("Connection: close")
-        lines.append("")
-        lines.append("")
+        head = _build_head(status, content_type, len(body), extra_headers)
         try:
-            self.transport.write("\r\n".join(lines).encode("utf-8") + body)
-            self.transport.close()
+            # Separate buffers: one gather write on uvloop and Python 3.12+; the
+            # 3.11 selector loop still joins them into a single copy first
+            self.transport.writelines((head, self._head_end(), body))
+            if not self._keep_alive:
+                self.transport.close()
         except Exception:
             log.debug("Client disconnected before response could be sent")
 
@@ -539,7 +984,7 @@ async def ws_handler(websocket, path=None):
     try:
         async for message in websocket:
             try:
-                msg = json.loads(message)
+                msg = _loads(message)
                 if msg.get("action") == "put" and "data" in msg:
                     client_id = msg.get("client_id", "")
                     client_label = msg.get("client_label", "")
@@ -547,26 +992,25 @@ async def ws_handler(websocket, path=None):
                     if base_version is not None:
                         base_version = int(base_version)
                     try:
-                        version = write_data(
-                            json.dumps(msg["data"]),
+                        version, _ = await _run_write(
+                            _write_obj,
+                            msg["data"],
                             client_id=client_id,
                             client_label=client_label,
                             base_version=base_version,
                         )
                     except VersionConflict as exc:
-                        await websocket.send(json.dumps({
+                        await websocket.send(_dumps({
                             "type": "version_conflict",
                             "server_version": exc.server_version,
                             "server_data": exc.server_data,
-                        }))
+                        }).decode("utf-8"))
                         continue
-                    await broadcast(version, sender=websocket)
-                    await websocket.send(
-                        json.dumps({"type": "ack", "version": version})
-                    )
+                    schedule_broadcast(version, sender=websocket)
+                    await websocket.send(_ACK_TMPL % version)
             except (json.JSONDecodeError, ValueError):
                 await websocket.send(
-                    json.dumps({"type": "error", "message": "Invalid payload"})
+                    _dumps({"type": "error", "message": "Invalid payload"}).decode("utf-8")
                 )
     except websockets.exceptions.ConnectionClosed as exc:
         log.info("WebSocket client disconnected: %s", exc)
@@ -581,21 +1025,38 @@ async def main(port: int):
     loop = asyncio.get_event_loop()
 
     # Start REST server
-    rest_server = await loop.create_server(RESTProtocol, "0.0.0.0", port)
+    rest_server = await loop.create_server(RESTProtocol, "0.0.0.0", port, backlog=LISTEN_BACKLOG)
 
     # Start WebSocket server on port+1
     ws_port = port + 1
-    ws_server = await ws_serve(ws_handler, "0.0.0.0", ws_port)
+    ws_server = await ws_serve(ws_handler, "0.0.0.0", ws_port, backlog=LISTEN_BACKLOG)
     log.info("Chore Tracker sync server running")
     log.info("  REST:      http://0.0.0.0:%d/data", port)
     log.info("  WebSocket: ws://0.0.0.0:%d", ws_port)
     log.info("  Data file: %s", os.path.abspath(data_file))
     log.info("  Changelog: %s", os.path.abspath(changelog_file))
+    log.info("  Loop:      %s", type(loop).__module__.split(".")[0])
     if static_root:
         log.info("  Static:    http://0.0.0.0:%d/  → %s", port, os.path.abspath(static_root))
     await asyncio.Future()  # run forever
 
 
+def _run(coro):
+    """Run coro on uvloop if it is installed, otherwise on asyncio's default loop."""
+    if uvloop is None:
+        return asyncio.run(coro)
+    uvloop_run = getattr(uvloop, "run", None)
+    if uvloop_run is not None:
+        return uvloop_run(coro)
+    # uvloop.run() only exists in uvloop >= 0.18; older packaged versions
+    # (e.g. Debian bookworm's 0.17) still provide new_event_loop()
+    if hasattr(asyncio, "Runner"):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(coro)
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return asyncio.run(coro)
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Chore Tracker sync server")
     parser.add_argument(
@@ -624,4 +1085,4 @@ if __name__ == "__main__":
     elif args.static:
         static_root = args.static
 
-    asyncio.run(main(args.port))
+    _run(main(args.port))
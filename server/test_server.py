@@ -2,10 +2,12 @@
 Tests for the Chore Tracker sync server.
 
 Covers:
-  - REST API (GET/PUT /data, GET /version, OPTIONS, 404, 413, bad Content-Length)
+  - REST API (GET/PUT /data, GET /version, OPTIONS, 404, 413, bad Content-Length, keep-alive)
   - WebSocket lifecycle (connect, put, broadcast, ack)
   - Abrupt client disconnect (the original crash scenario)
   - Logging output verification
+  - Broadcast fan-out and coalescing
+  - Event loop selection (uvloop fallback)
   - Static file serving
   - Atomic write safety
   - Concurrent multi-client interactions
@@ -63,14 +65,16 @@ async def _http_request(port, method, path, body=b"", headers=None):
     writer.write("\r\n".join(req_lines).encode() + body)
     await writer.drain()
 
-    # Read full response (server sends Connection: close, so read until EOF)
-    data = await asyncio.wait_for(reader.read(), timeout=5)
+    # Connections are kept alive, so read exactly one response
+    status_code, resp_headers, resp_body = await _read_response(reader)
     writer.close()
+    return status_code, resp_headers, resp_body
+
 
-    # Parse status
-    header_end = data.index(b"\r\n\r\n")
-    header_block = data[:header_end].decode()
-    resp_body = data[header_end + 4:]
+async def _read_response(reader):
+    """Read one HTTP response framed by Content-Length; return (status, headers, body)."""
+    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=5)
+    header_block = head[:-4].decode()
     status_line = header_block.split("\r\n")[0]
     status_code = int(status_line.split(" ", 2)[1])
 
@@ -80,6 +84,8 @@ async def _http_request(port, method, path, body=b"", headers=None):
             k, v = line.split(":", 1)
             resp_headers[k.strip().lower()] = v.strip()
 
+    length = int(resp_headers.get("content-length", 0))
+    resp_body = await asyncio.wait_for(reader.readexactly(length), timeout=5)
     return status_code, resp_headers, resp_body
 
 
@@ -103,6 +109,10 @@ async def server(tmp_path):
     srv.changelog_file = str(tmp_path / "test-data-changelog.json")
     srv.static_root = static_dir
     srv.CLIENTS.clear()
+    # Drop any coalesced broadcast left over from a previous test's event loop
+    srv._broadcast_task = None
+    srv._pending_version = None
+    srv._pending_senders.clear()
 
     loop = asyncio.get_event_loop()
     rest_server = await loop.create_server(srv.RESTProtocol, "127.0.0.1", rest_port)
@@ -184,6 +194,13 @@ class TestRESTAPI:
         status, _, _ = await _http_request(server["rest_port"], "GET", "/nonexistent")
         assert status == 404
 
+    @pytest.mark.asyncio
+    async def test_unsupported_method_on_known_path(self, server):
+        """A known path with a method it doesn't support returns 404."""
+        for method, path in (("PUT", "/version"), ("POST", "/data"), ("DELETE", "/data")):
+            status, _, _ = await _http_request(server["rest_port"], method, path)
+            assert status == 404, (method, path)
+
     @pytest.mark.asyncio
     async def test_static_index(self, server):
         """GET / serves index.html from static root."""
@@ -192,6 +209,307 @@ class TestRESTAPI:
         assert b"<html>" in body
         assert headers.get("content-type") == "text/html"
 
+    @pytest.mark.asyncio
+    async def test_put_split_across_segments(self, server):
+        """A PUT whose headers and body trickle in over many writes is reassembled."""
+        payload = json.dumps({"rooms": [{"name": "Attic"}], "pad": "y" * 5000}).encode()
+        raw = (
+            b"PUT /data HTTP/1.1\r\n"
+            b"Host: localhost\r\n"
+            b"Connection: close\r\n"
+            b"Content-Length: " + str(len(payload)).encode() + b"\r\n"
+            b"\r\n" + payload
+        )
+        reader, writer = await asyncio.open_connection("127.0.0.1", server["rest_port"])
+        for i in range(0, len(raw), 700):
+            writer.write(raw[i:i + 700])
+            await writer.drain()
+            await asyncio.sleep(0.001)
+        data = await asyncio.wait_for(reader.read(), timeout=5)
+        writer.close()
+        assert data.startswith(b"HTTP/1.1 200 OK")
+
+        status, _, body = await _http_request(server["rest_port"], "GET", "/data")
+        assert json.loads(body)["rooms"][0]["name"] == "Attic"
+
+    @pytest.mark.asyncio
+    async def test_header_terminator_split_byte_by_byte(self, server):
+        """The blank line ending the headers is found even when split across segments."""
+        raw = b"GET /version HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n"
+        reader, writer = await asyncio.open_connection("127.0.0.1", server["rest_port"])
+        for i in range(len(raw)):
+            writer.write(raw[i:i + 1])
+            await writer.drain()
+            await asyncio.sleep(0.001)
+        data = await asyncio.wait_for(reader.read(), timeout=5)
+        writer.close()
+        assert data.startswith(b"HTTP/1.1 200 OK")
+
+    @pytest.mark.asyncio
+    async def test_static_binary_file(self, server):
+        """Larger binary assets are sent intact with a matching Content-Length."""
+        fonts_dir = os.path.join(server["static_dir"], "fonts")
+        os.makedirs(fonts_dir)
+        blob = os.urandom(300 * 1024)
+        with open(os.path.join(fonts_dir, "test.woff2"), "wb") as f:
+            f.write(blob)
+        status, headers, body = await _http_request(server["rest_port"], "GET", "/fonts/test.woff2")
+        assert status == 200
+        assert headers.get("content-type") == "font/woff2"
+        assert int(headers["content-length"]) == len(blob)
+        assert body == blob
+        # sw.js re-fetches fonts through the HTTP cache on update
+        assert "cache-control" not in headers
+
+    @pytest.mark.asyncio
+    async def test_static_without_loop_sendfile(self, server, monkeypatch):
+        """Static files are still served on loops without sendfile (e.g. uvloop)."""
+        async def no_sendfile(*args, **kwargs):
+            raise NotImplementedError
+        monkeypatch.setattr(asyncio.get_running_loop(), "sendfile", no_sendfile)
+        status, headers, body = await _http_request(server["rest_port"], "GET", "/")
+        assert status == 200
+        assert body == b"<html><body>test</body></html>"
+
+    @pytest.mark.asyncio
+    async def test_static_cannot_escape_root(self, server):
+        """Traversal, sibling-prefix and symlink paths outside the static root are 404."""
+        parent = os.path.dirname(server["static_dir"])
+        with open(os.path.join(parent, "secret.txt"), "w") as f:
+            f.write("secret")
+        sibling = server["static_dir"] + "2"
+        os.makedirs(sibling)
+        with open(os.path.join(sibling, "other.txt"), "w") as f:
+            f.write("secret")
+        os.symlink(os.path.join(parent, "secret.txt"), os.path.join(server["static_dir"], "link.txt"))
+
+        sibling_name = os.path.basename(sibling)
+        for path in ("/../secret.txt", "/%2e%2e/secret.txt", "/%2F..%2Fsecret.txt",
+                     f"/../{sibling_name}/other.txt", "/link.txt"):
+            status, _, body = await _http_request(server["rest_port"], "GET", path)
+            assert status == 404, path
+            assert b"secret" not in body
+
+    @pytest.mark.asyncio
+    async def test_static_non_regular_files_404(self, server):
+        """Directories and FIFOs under the static root are 404, without blocking."""
+        os.makedirs(os.path.join(server["static_dir"], "icons"))
+        os.mkfifo(os.path.join(server["static_dir"], "pipe"))
+        for path in ("/icons", "/pipe"):
+            status, _, _ = await _http_request(server["rest_port"], "GET", path)
+            assert status == 404, path
+
+    @pytest.mark.asyncio
+    async def test_static_file_change_is_served(self, server):
+        """Editing a static file after it was served returns the new content."""
+        status, _, body = await _http_request(server["rest_port"], "GET", "/index.html")
+        assert body == b"<html><body>test</body></html>"
+        with open(os.path.join(server["static_dir"], "index.html"), "w") as f:
+            f.write("<html><body>updated page</body></html>")
+        status, headers, body = await _http_request(server["rest_port"], "GET", "/index.html")
+        assert status == 200
+        assert body == b"<html><body>updated page</body></html>"
+        assert "cache-control" not in headers
+
+    @pytest.mark.asyncio
+    async def test_keep_alive_multiple_requests(self, server):
+        """Several requests can be sent one after another on the same connection."""
+        reader, writer = await asyncio.open_connection("127.0.0.1", server["rest_port"])
+        payload = json.dumps({"rooms": [{"name": "Hall"}]}).encode()
+        writer.write(
+            b"PUT /data HTTP/1.1\r\nHost: localhost\r\n"
+            b"Content-Length: " + str(len(payload)).encode() + b"\r\n\r\n" + payload
+        )
+        status, headers, body = await _read_response(reader)
+        assert status == 200
+        assert headers.get("connection") == "keep-alive"
+        version = json.loads(body)["version"]
+
+        writer.write(b"GET /data HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        status, _, body = await _read_response(reader)
+        assert status == 200
+        assert json.loads(body)["_version"] == version
+        writer.close()
+
+    @pytest.mark.asyncio
+    async def test_slow_upload_outlasting_idle_timeout(self, server, monkeypatch):
+        """A request still arriving is not cut off by KEEP_ALIVE_TIMEOUT."""
+        monkeypatch.setattr(srv.RESTProtocol, "KEEP_ALIVE_TIMEOUT", 0.3)
+        payload = json.dumps({"rooms": [{"name": "Porch"}], "pad": "z" * 800}).encode()
+        raw = (
+            b"PUT /data HTTP/1.1\r\nHost: localhost\r\n"
+            b"Content-Length: " + str(len(payload)).encode() + b"\r\n\r\n" + payload
+        )
+        reader, writer = await asyncio.open_connection("127.0.0.1", server["rest_port"])
+        # ~0.8 s in total, but never more than 0.1 s between segments
+        for i in range(0, len(raw), len(raw) // 8 + 1):
+            writer.write(raw[i:i + len(raw) // 8 + 1])
+            await writer.drain()
+            await asyncio.sleep(0.1)
+        status, _, _ = await _read_response(reader)
+        assert status == 200
+        writer.close()
+
+        status, _, body = await _http_request(server["rest_port"], "GET", "/data")
+        assert json.loads(body)["rooms"][0]["name"] == "Porch"
+
+    @pytest.mark.asyncio
+    async def test_stalled_request_closed_after_idle_timeout(self, server, monkeypatch):
+        """A partial request that stops sending is closed after KEEP_ALIVE_TIMEOUT."""
+        monkeypatch.setattr(srv.RESTProtocol, "KEEP_ALIVE_TIMEOUT", 0.2)
+        reader, writer = await asyncio.open_connection("127.0.0.1", server["rest_port"])
+        writer.write(b"PUT /data HTTP/1.1\r\nHost: localhost\r\nContent-Length: 10\r\n\r\nabc")
+        await writer.drain()
+        assert await asyncio.wait_for(reader.read(), timeout=5) == b""
+        writer.close()
+
+    @pytest.mark.asyncio
+    async def test_pipelined_requests_answered_in_order(self, server):
+        """Requests sent back-to-back in one write get responses in order."""
+        reader, writer = await asyncio.open_connection("127.0.0.1", server["rest_port"])
+        writer.write(
+            b"GET /version HTTP/1.1\r\nHost: localhost\r\n\r\n"
+            b"GET /nonexistent HTTP/1.1\r\nHost: localhost\r\n\r\n"
+            b"GET /data HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n"
+        )
+        statuses = []
+        for _ in range(3):
+            status, _, _ = await _read_response(reader)
+            statuses.append(status)
+        assert statuses == [200, 404, 200]
+        # The last request asked for the connection to be closed
+        assert await asyncio.wait_for(reader.read(), timeout=5) == b""
+        writer.close()
+
+    @pytest.mark.asyncio
+    async def test_connection_close_among_other_options(self, server):
+        """A close option in a Connection list closes the connection."""
+        reader, writer = await asyncio.open_connection("127.0.0.1", server["rest_port"])
+        writer.write(b"GET /version HTTP/1.1\r\nHost: localhost\r\nConnection: close, TE\r\n\r\n")
+        status, headers, _ = await _read_response(reader)
+        assert status == 200
+        assert headers.get("connection") == "close"
+        assert await asyncio.wait_for(reader.read(), timeout=5) == b""
+        writer.close()
+
+    @pytest.mark.asyncio
+    async def test_http10_closes_by_default(self, server):
+        """HTTP/1.0 requests without a keep-alive header get Connection: close."""
+        reader, writer = await asyncio.open_connection("127.0.0.1", server["rest_port"])
+        writer.write(b"GET /version HTTP/1.0\r\n\r\n")
+        status, headers, _ = await _read_response(reader)
+        assert status == 200
+        assert headers.get("connection") == "close"
+        assert await asyncio.wait_for(reader.read(), timeout=5) == b""
+        writer.close()
+
+    @pytest.mark.asyncio
+    async def test_idle_keep_alive_connection_closed(self, server, monkeypatch):
+        """An idle keep-alive connection is closed after KEEP_ALIVE_TIMEOUT."""
+        monkeypatch.setattr(srv.RESTProtocol, "KEEP_ALIVE_TIMEOUT", 0.2)
+        reader, writer = await asyncio.open_connection("127.0.0.1", server["rest_port"])
+        writer.write(b"GET /version HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        status, _, _ = await _read_response(reader)
+        assert status == 200
+        assert await asyncio.wait_for(reader.read(), timeout=5) == b""
+        writer.close()
+
+    @pytest.mark.asyncio
+    async def test_header_names_case_insensitive(self, server):
+        """Header names match regardless of case; values keep their case."""
+        payload = json.dumps({"rooms": [{"id": "r1", "name": "Den"}]}).encode()
+        reader, writer = await asyncio.open_connection("127.0.0.1", server["rest_port"])
+        writer.write(
+            b"PUT /data HTTP/1.1\r\n"
+            b"HOST: localhost\r\n"
+            b"x-CLIENT-id:   dev-1  \r\n"
+            b"X-Client-Label: Kitchen Tablet\r\n"
+            b"content-LENGTH: " + str(len(payload)).encode() + b"\r\n"
+            b"\r\n" + payload
+        )
+        status, _, _ = await _read_response(reader)
+        writer.close()
+        assert status == 200
+
+        status, _, body = await _http_request(server["rest_port"], "GET", "/changelog")
+        last = json.loads(body)[-1]
+        assert last["client_id"] == "dev-1"
+        assert last["client_label"] == "Kitchen Tablet"
+
+    @pytest.mark.asyncio
+    async def test_chunked_request_rejected(self, server):
+        """A Transfer-Encoding body gets 400 and the connection is closed."""
+        reader, writer = await asyncio.open_connection("127.0.0.1", server["rest_port"])
+        writer.write(
+            b"PUT /data HTTP/1.1\r\nHost: localhost\r\nTransfer-Encoding: chunked\r\n\r\n"
+            b"1c\r\nGET /version HTTP/1.1\r\n\r\n\r\n0\r\n\r\n"
+        )
+        status, headers, _ = await _read_response(reader)
+        assert status == 400
+        assert headers.get("connection") == "close"
+        # The chunk data must not be answered as a second request
+        assert await asyncio.wait_for(reader.read(), timeout=5) == b""
+        writer.close()
+
+    @pytest.mark.asyncio
+    async def test_duplicate_content_length_rejected(self, server):
+        """Two Content-Length headers get 400 and the connection is closed."""
+        reader, writer = await asyncio.open_connection("127.0.0.1", server["rest_port"])
+        writer.write(
+            b"PUT /data HTTP/1.1\r\nHost: localhost\r\n"
+            b"Content-Length: 2\r\nContent-Length: 30\r\n\r\n"
+            b"{}GET /version HTTP/1.1\r\n\r\n"
+        )
+        status, headers, _ = await _read_response(reader)
+        assert status == 400
+        assert headers.get("connection") == "close"
+        assert await asyncio.wait_for(reader.read(), timeout=5) == b""
+        writer.close()
+
+    @pytest.mark.asyncio
+    async def test_whitespace_before_header_colon_rejected(self, server):
+        """A "Name : value" header line gets 400 and the connection is closed."""
+        reader, writer = await asyncio.open_connection("127.0.0.1", server["rest_port"])
+        writer.write(
+            b"PUT /data HTTP/1.1\r\nHost: localhost\r\n"
+            b"Content-Length : 28\r\n\r\n"
+            b"GET /version HTTP/1.1\r\n\r\n"
+        )
+        status, headers, _ = await _read_response(reader)
+        assert status == 400
+        assert headers.get("connection") == "close"
+        assert await asyncio.wait_for(reader.read(), timeout=5) == b""
+        writer.close()
+
+    @pytest.mark.asyncio
+    async def test_colon_in_header_value_allowed(self, server):
+        """Spaces before a colon inside a header value are fine."""
+        payload = json.dumps({"rooms": [{"id": "r1", "name": "Den"}]}).encode()
+        status, _, _ = await _http_request(
+            server["rest_port"], "PUT", "/data", body=payload,
+            headers={"X-Client-Label": "Bob :)"},
+        )
+        assert status == 200
+
+    @pytest.mark.asyncio
+    async def test_negative_content_length(self, server):
+        """A negative Content-Length is rejected with 400."""
+        reader, writer = await asyncio.open_connection("127.0.0.1", server["rest_port"])
+        writer.write(b"PUT /data HTTP/1.1\r\nHost: localhost\r\nContent-Length: -5\r\n\r\n")
+        status, _, _ = await _read_response(reader)
+        writer.close()
+        assert status == 400
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("value", [b"+5", b"1_0"])
+    async def test_non_digit_content_length(self, server, value):
+        """A Content-Length that int() accepts but isn't all ASCII digits is rejected with 400."""
+        reader, writer = await asyncio.open_connection("127.0.0.1", server["rest_port"])
+        writer.write(b"PUT /data HTTP/1.1\r\nHost: localhost\r\nContent-Length: " + value + b"\r\n\r\n")
+        status, _, _ = await _read_response(reader)
+        writer.close()
+        assert status == 400
+
     @pytest.mark.asyncio
     async def test_invalid_content_length(self, server):
         """Malformed Content-Length returns 400."""
@@ -248,6 +566,17 @@ class TestWebSocket:
             assert broadcast["type"] == "data-changed"
             assert broadcast["version"] == ack["version"]
 
+    @pytest.mark.asyncio
+    async def test_ws_broadcast_is_text_frame(self, server):
+        """Broadcasts go out as text frames so browsers can JSON.parse(evt.data)."""
+        uri = f"ws://127.0.0.1:{server['ws_port']}"
+        async with ws_connect(uri) as client1, ws_connect(uri) as client2:
+            await client1.send(json.dumps({"action": "put", "data": {"task": "mop"}}))
+            ack = await asyncio.wait_for(client1.recv(), timeout=5)
+            broadcast = await asyncio.wait_for(client2.recv(), timeout=5)
+            assert isinstance(ack, str)
+            assert isinstance(broadcast, str)
+
     @pytest.mark.asyncio
     async def test_ws_invalid_json(self, server):
         """Sending invalid JSON over WS returns an error message."""
@@ -394,6 +723,33 @@ class TestAtomicWrite:
             data = json.loads(f.read())  # must not raise
         assert data["big"] == "x" * 10000
 
+    @pytest.mark.asyncio
+    async def test_no_temp_files_left_behind(self, server):
+        """Data and changelog writes rename their temp files into place."""
+        for i in range(3):
+            payload = json.dumps({"rooms": [{"id": f"r{i}", "name": f"Room {i}"}]}).encode()
+            status, _, _ = await _http_request(
+                server["rest_port"], "PUT", "/data", body=payload,
+                headers={"Content-Type": "application/json"},
+            )
+            assert status == 200
+        data_dir = os.path.dirname(server["data_path"])
+        assert not [n for n in os.listdir(data_dir) if n.endswith(".tmp")]
+        with open(srv.changelog_file) as f:
+            assert len(json.load(f)) == 3
+
+    @pytest.mark.asyncio
+    async def test_changelog_file_mode_follows_umask(self, server):
+        """The changelog gets the umask-derived mode a plain open("w") would give."""
+        payload = json.dumps({"rooms": [{"id": "r1", "name": "Kitchen"}]}).encode()
+        status, _, _ = await _http_request(
+            server["rest_port"], "PUT", "/data", body=payload,
+            headers={"Content-Type": "application/json"},
+        )
+        assert status == 200
+        mode = os.stat(srv.changelog_file).st_mode & 0o777
+        assert mode == srv._DEFAULT_FILE_MODE
+
     @pytest.mark.asyncio
     async def test_version_increases(self, server):
         """Each PUT gets a newer _version timestamp."""
@@ -410,6 +766,53 @@ class TestAtomicWrite:
 
         assert versions == sorted(versions), "Versions should be monotonically increasing"
 
+    @pytest.mark.asyncio
+    async def test_slow_write_does_not_block_other_requests(self, server, monkeypatch):
+        """Disk writes run off the event loop, so other requests are still served."""
+        original = srv._atomic_write
+
+        def slow_atomic_write(path, blob, mode=None):
+            time.sleep(0.5)
+            return original(path, blob, mode=mode)
+
+        monkeypatch.setattr(srv, "_atomic_write", slow_atomic_write)
+        payload = json.dumps({"rooms": []}).encode()
+        put = asyncio.create_task(_http_request(
+            server["rest_port"], "PUT", "/data", body=payload,
+            headers={"Content-Type": "application/json"},
+        ))
+        await asyncio.sleep(0.1)
+
+        start = time.monotonic()
+        status, _, _ = await _http_request(server["rest_port"], "GET", "/version")
+        assert status == 200
+        assert time.monotonic() - start < 0.3
+        assert not put.done()
+
+        status, _, _ = await put
+        assert status == 200
+
+    @pytest.mark.asyncio
+    async def test_get_sees_external_file_change(self, server):
+        """The cached GET /data body is invalidated when the file changes on disk."""
+        payload = json.dumps({"seq": 1}).encode()
+        status, _, _ = await _http_request(
+            server["rest_port"], "PUT", "/data", body=payload,
+            headers={"Content-Type": "application/json"},
+        )
+        assert status == 200
+        status, _, body = await _http_request(server["rest_port"], "GET", "/data")
+        assert json.loads(body)["seq"] == 1
+
+        # Replace the file behind the server's back (e.g. restored from backup)
+        tmp = server["data_path"] + ".new"
+        with open(tmp, "w") as f:
+            json.dump({"seq": 2, "restored": True}, f)
+        os.replace(tmp, server["data_path"])
+
+        status, _, body = await _http_request(server["rest_port"], "GET", "/data")
+        assert json.loads(body) == {"seq": 2, "restored": True}
+
 
 # ── Logging Tests ─────────────────────────────────────────────
 
@@ -440,6 +843,151 @@ class TestLogging:
         )
 
 
+# ── Broadcast Tests ──────────────────────────────────────────
+
+class _RecordingSocket:
+    """Stand-in WebSocket that records the messages sent to it."""
+
+    def __init__(self):
+        self.messages = []
+
+    async def send(self, msg):
+        self.messages.append(json.loads(msg))
+
+
+class TestBroadcast:
+    """WebSocket fan-out: slow clients and coalescing of write bursts."""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_does_not_wait_for_slow_client(self, server, monkeypatch):
+        """A client that never finishes a send is closed without delaying the others."""
+        monkeypatch.setattr(srv, "BROADCAST_SEND_TIMEOUT", 0.2)
+
+        class SlowSocket:
+            closed = False
+
+            async def send(self, msg):
+                await asyncio.sleep(60)
+
+            async def close(self):
+                self.closed = True
+
+        class FastSocket:
+            def __init__(self):
+                self.received_at = None
+
+            async def send(self, msg):
+                self.received_at = time.monotonic()
+
+        slow, fast = SlowSocket(), FastSocket()
+        srv.CLIENTS.update({slow, fast})
+
+        start = time.monotonic()
+        await srv.broadcast(version=1)
+        await asyncio.sleep(0)
+
+        assert fast.received_at - start < 0.1
+        assert time.monotonic() - start < 1
+        assert slow not in srv.CLIENTS and fast in srv.CLIENTS
+        assert slow.closed
+        # The close task is held until it finishes, then released
+        await asyncio.sleep(0.01)
+        assert not srv._background_tasks
+
+    @pytest.mark.asyncio
+    async def test_burst_sends_latest_version_once(self, server):
+        """Several versions scheduled together produce one message with the newest."""
+        ws = _RecordingSocket()
+        srv.CLIENTS.add(ws)
+        for version in (101, 103, 102):
+            srv.schedule_broadcast(version)
+        await asyncio.sleep(0.1)
+        assert ws.messages == [{"type": "data-changed", "version": 103}]
+
+    @pytest.mark.asyncio
+    async def test_sender_skipped_only_if_sole_writer(self, server):
+        """The sender is excluded only when every coalesced write came from it."""
+        writer, other = _RecordingSocket(), _RecordingSocket()
+        srv.CLIENTS.update({writer, other})
+
+        srv.schedule_broadcast(1, sender=writer)
+        srv.schedule_broadcast(2, sender=writer)
+        await asyncio.sleep(0.1)
+        assert writer.messages == []
+        assert other.messages == [{"type": "data-changed", "version": 2}]
+
+        # A REST write (no sender) in the same burst means the writer needs it too
+        srv.schedule_broadcast(3, sender=writer)
+        srv.schedule_broadcast(4)
+        await asyncio.sleep(0.1)
+        assert writer.messages == [{"type": "data-changed", "version": 4}]
+
+    @pytest.mark.asyncio
+    async def test_write_during_fan_out_is_sent(self, server):
+        """A version queued while a broadcast is in flight gets its own broadcast."""
+        sent = []
+        release = asyncio.Event()
+
+        class GatedSocket:
+            async def send(self, msg):
+                sent.append(json.loads(msg)["version"])
+                await release.wait()
+
+        srv.CLIENTS.add(GatedSocket())
+        srv.schedule_broadcast(1)
+        await asyncio.sleep(0.05)
+        srv.schedule_broadcast(2)
+        release.set()
+        await asyncio.sleep(0.1)
+        assert sent == [1, 2]
+
+
+# ── Event Loop Selection Tests ───────────────────────────────
+
+class TestEventLoopSelection:
+    """_run() uses uvloop when it can and asyncio otherwise."""
+
+    @staticmethod
+    async def _answer():
+        await asyncio.sleep(0)
+        return 42
+
+    def test_without_uvloop(self, monkeypatch):
+        """With uvloop missing, the stdlib loop is used."""
+        monkeypatch.setattr(srv, "uvloop", None)
+        assert srv._run(self._answer()) == 42
+
+    def test_old_uvloop_without_run(self, monkeypatch):
+        """uvloop < 0.18 has no uvloop.run(); its new_event_loop() is used instead."""
+        calls = []
+
+        class OldUvloop:
+            __version__ = "0.17.0"
+
+            @staticmethod
+            def new_event_loop():
+                calls.append(True)
+                return asyncio.new_event_loop()
+
+        monkeypatch.setattr(srv, "uvloop", OldUvloop)
+        assert srv._run(self._answer()) == 42
+        assert calls == [True]
+
+    def test_uvloop_run_used_when_available(self, monkeypatch):
+        """uvloop.run() is used when the installed uvloop provides it."""
+        calls = []
+
+        class NewUvloop:
+            @staticmethod
+            def run(coro):
+                calls.append(coro)
+                return asyncio.run(coro)
+
+        monkeypatch.setattr(srv, "uvloop", NewUvloop)
+        assert srv._run(self._answer()) == 42
+        assert len(calls) == 1
+
+
 # ── Simulated User Interaction Tests ─────────────────────────
 
 class _SimulatedDevice:
@@ -883,6 +1431,26 @@ class TestVersionGuard:
         assert "server_data" in conflict_data
         assert conflict_data["server_data"]["_version"] == v2
 
+    @pytest.mark.asyncio
+    async def test_concurrent_puts_same_base_version(self, server):
+        """Of two simultaneous PUTs from the same base version, exactly one wins."""
+        payload = json.dumps({"rooms": [{"id": "r1", "name": "Kitchen"}], "users": []}).encode()
+        status, _, body = await _http_request(
+            server["rest_port"], "PUT", "/data", body=payload,
+            headers={"Content-Type": "application/json"},
+        )
+        v1 = json.loads(body)["version"]
+
+        results = await asyncio.gather(*(
+            _http_request(
+                server["rest_port"], "PUT", "/data",
+                body=json.dumps({"rooms": [{"id": "r1", "name": f"Kitchen {i}"}], "users": []}).encode(),
+                headers={"Content-Type": "application/json", "X-Base-Version": str(v1)},
+            )
+            for i in range(2)
+        ))
+        assert sorted(status for status, _, _ in results) == [200, 409]
+
     @pytest.mark.asyncio
     async def test_put_without_base_version_succeeds(self, server):
         """PUT /data without X-Base-Version (legacy client) still works."""
@@ -945,6 +1513,21 @@ class TestVersionGuard:
         assert checked[0]["room"] == "r1"
         assert checked[0]["task"] == "t1"
 
+    @pytest.mark.asyncio
+    async def test_changelog_non_ascii_label(self, server):
+        """A non-ASCII client label survives the changelog write and read back."""
+        payload = json.dumps({"rooms": [{"id": "r1", "name": "Kitchen"}], "users": [], "entries": {}}).encode()
+        status, _, _ = await _http_request(
+            server["rest_port"], "PUT", "/data",
+            body=payload,
+            headers={"Content-Type": "application/json", "X-Client-Id": "device-Z", "X-Client-Label": "Zoë’s tablet"},
+        )
+        assert status == 200
+
+        status, _, body = await _http_request(server["rest_port"], "GET", "/changelog")
+        assert status == 200
+        assert json.loads(body)[-1]["client_label"] == "Zoë’s tablet"
+
     @pytest.mark.asyncio
     async def test_get_changelog_empty(self, server):
         """GET /changelog returns empty list when no changes recorded."""